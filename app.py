@@ -6,13 +6,19 @@
 # =============================================================================
 
 import asyncio
-import base64
+import binascii
 import io
 import json
 import os
+import queue
+import re
+import subprocess
 import tempfile
 import threading
 import time
+import traceback
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
@@ -21,10 +27,23 @@ from typing import Any, Dict, List, Optional
 import cv2
 import matplotlib
 
-matplotlib.use("Agg")
+matplotlib.use("Agg", force=True)
+# 無頭渲染調校：關閉開啟圖形數量警告，並啟用向量路徑簡化以降低 plot 成本
+matplotlib.rcParams["figure.max_open_warning"] = 0
+matplotlib.rcParams["path.simplify"] = True
+matplotlib.rcParams["path.simplify_threshold"] = 1.0
+matplotlib.rcParams["agg.path.chunksize"] = 10000
+# 圖表僅供瀏覽器展示，90 dpi 較預設 100 少近兩成像素，渲染與編碼同步縮短
+matplotlib.rcParams["figure.dpi"] = 90
 
 import matplotlib.pyplot as plt
 import numpy as np
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 選用依賴，缺少時走標準 json 路徑
+    orjson = None
+
 from dotenv import load_dotenv
 from fastapi import (
     FastAPI,
@@ -36,10 +55,11 @@ from fastapi import (
     WebSocket,
 )
 from fastapi.websockets import WebSocketDisconnect
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.gzip import GZipMiddleware
 from vitallens import Method, VitalLens
 
 # Load environment variables from .env if present
@@ -48,6 +68,116 @@ load_dotenv()
 MAX_UPLOAD_SIZE_BYTES = int(os.getenv("MAX_FILE_SIZE_MB", "50")) * 1024 * 1024
 MAX_VIDEO_DURATION_SECONDS = 45
 
+# API 回應序列化類別：orjson 可用時走 C 層序列化（原生支援 numpy），
+# 否則退回 starlette 的純 Python json 路徑
+APIResponse = ORJSONResponse if orjson is not None else JSONResponse
+
+
+def _series_mean(values: Any) -> float:
+    """
+    計算時間序列的 NaN 感知平均值。
+
+    將輸入（list 或 ndarray）一次性轉換為 float32 連續陣列後以向量化
+    reduction 求平均，避免在 Python 層逐元素迭代；VitalLens 回傳的
+    rolling 序列可能含 NaN 佔位值，一併忽略。
+
+    Args:
+        values: 數值序列（list、ndarray 或可轉換為陣列的物件）
+
+    Returns:
+        float: 序列平均值；序列全為 NaN 時返回 NaN
+    """
+    array = np.asarray(values, dtype=np.float32)
+    if array.size == 0:
+        return float("nan")
+    return float(np.nanmean(array))
+
+
+def _lttb(values: np.ndarray, threshold: int = 1000) -> tuple:
+    """
+    以 Largest-Triangle-Three-Buckets 將長波形降採樣至指定點數。
+
+    保留視覺特徵（極值、轉折）的同時把繪圖路徑頂點數壓到 threshold，
+    對數千點的 PPG/呼吸波形可將 Agg 渲染工作量縮減一個數量級。
+
+    Args:
+        values (np.ndarray): 一維數值序列
+        threshold (int): 目標輸出點數，預設 1000
+
+    Returns:
+        tuple: (x 索引陣列, y 數值陣列)；序列夠短時原樣返回
+    """
+    n = values.size
+    x = np.arange(n, dtype=np.float64)
+    if threshold < 3 or n <= threshold:
+        return x, values
+
+    y = values.astype(np.float64, copy=False)
+    # 中段資料的桶邊界；首尾兩點固定保留
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    out_x = np.empty(threshold, dtype=np.float64)
+    out_y = np.empty(threshold, dtype=values.dtype)
+    out_x[0], out_y[0] = x[0], values[0]
+    out_x[-1], out_y[-1] = x[-1], values[-1]
+
+    anchor_x, anchor_y = x[0], y[0]
+    for i in range(threshold - 2):
+        lo = edges[i]
+        hi = max(edges[i + 1], lo + 1)
+        if i + 2 < edges.size:
+            next_lo, next_hi = edges[i + 1], max(edges[i + 2], edges[i + 1] + 1)
+        else:
+            next_lo, next_hi = edges[i + 1], n
+        avg_x = (next_lo + next_hi - 1) / 2.0
+        avg_y = float(np.mean(y[next_lo:next_hi]))
+
+        bucket_x = x[lo:hi]
+        bucket_y = y[lo:hi]
+        areas = np.abs(
+            (anchor_x - avg_x) * (bucket_y - anchor_y)
+            - (anchor_x - bucket_x) * (avg_y - anchor_y)
+        )
+        best = lo + int(np.argmax(areas))
+        out_x[i + 1] = x[best]
+        out_y[i + 1] = values[best]
+        anchor_x, anchor_y = x[best], y[best]
+
+    return out_x, out_y
+
+
+def _batch_hr(waveforms: np.ndarray, fs: float) -> np.ndarray:
+    """
+    以單次批次 rFFT 對多張臉的 PPG 波形估算心率。
+
+    所有波形堆疊成 (F, N) 矩陣後沿樣本軸做一次 rfft，頻譜工作量
+    縮為單一 C 呼叫；僅在生理合理頻帶（0.75–2.5 Hz，即 45–150 bpm）
+    內取峰值。FFT 長度補零至至少 2048 點，使頻率解析度優於 1 bpm。
+
+    Args:
+        waveforms (np.ndarray): (F, N) float32 波形堆疊，短波形以零補齊
+        fs (float): 取樣率（Hz），即影片 FPS
+
+    Returns:
+        np.ndarray: 每張臉的心率估計（bpm）；頻帶內無能量時為 NaN
+    """
+    n_samples = waveforms.shape[1]
+    n_fft = max(2048, 1 << int(np.ceil(np.log2(max(n_samples, 2)))))
+    centered = waveforms - waveforms.mean(axis=1, keepdims=True)
+    spectrum = np.abs(np.fft.rfft(centered, n=n_fft, axis=1))
+
+    freqs = np.fft.rfftfreq(n_fft, d=1.0 / fs)
+    band = (freqs >= 0.75) & (freqs <= 2.5)
+    if not band.any():
+        return np.full(waveforms.shape[0], np.nan, dtype=np.float32)
+
+    band_indices = np.flatnonzero(band)
+    band_power = spectrum[:, band_indices]
+    peaks = band_indices[np.argmax(band_power, axis=1)]
+    rates = (freqs[peaks] * 60.0).astype(np.float32)
+    # 頻帶內沒有能量（全零或平直波形）時不給估計值
+    rates[band_power.max(axis=1) <= 1e-6] = np.nan
+    return rates
+
 
 def _now_ts() -> str:
     """
@@ -64,6 +194,140 @@ def _now_ts() -> str:
     return datetime.now().strftime("%Y%m%d_%H%M%S")
 
 
+# 終端狀態：必須完整送達、不可被節流或覆蓋的廣播 stage
+_TERMINAL_STAGES = frozenset({"complete", "error"})
+
+
+def _dumps_message(message: Dict[str, Any]) -> str:
+    """
+    將廣播消息序列化為 JSON 字串（每則消息僅此一次）。
+
+    Args:
+        message (Dict[str, Any]): 要序列化的消息字典
+
+    Returns:
+        str: JSON 字串
+    """
+    if orjson is not None:
+        return orjson.dumps(message).decode("utf-8")
+    return json.dumps(message, ensure_ascii=False)
+
+# 錯誤分類：單一預編譯 alternation 一趟掃過錯誤訊息，
+# 取代逐條 substring 檢查；成對條件以雙向 alternation 表示
+_ERROR_PATTERN = re.compile(
+    r"(?P<array>truth value of an array)"
+    r"|(?P<probe>Problem probing video.*NoneType|NoneType.*Problem probing video)"
+    r"|(?P<noface>No face detected)"
+    r"|(?P<api>API.*key|key.*API)",
+    re.DOTALL,
+)
+_ERROR_MESSAGES = {
+    "array": (
+        "Video processing encountered data issues. Potential causes:\n"
+        "- Video too short (recommend at least 10 seconds)\n"
+        "- Face not clear enough\n"
+        "- Poor lighting\n"
+        "Please capture a longer, clearer video"
+    ),
+    "probe": "Video format compatibility issue detected. Try converting to MP4.",
+    "noface": "No face detected. Please ensure the face is clearly visible with adequate lighting.",
+    "api": "API Key error or quota exceeded. Please verify your VitalLens API settings.",
+}
+
+
+class LatestQueue:
+    """
+    latest-value 語意的單連接消息通道。
+
+    一般進度消息只保留最新一則（舊進度被新進度覆蓋），終端狀態
+    （complete/error）則逐一排隊保證送達。隊列永遠不會「滿」，
+    因此緩慢的客戶端不會被判定斷線，恢復消費時直接看到最新進度。
+    終端隊列以 deque(maxlen) 實現環形語意：超出容量時自動丟棄最舊
+    一則，而不是拒收新消息，保留堆積物件數量的上界。
+
+    Attributes:
+        _terminal (deque): 待送達的終端狀態消息（環形，最多 _MAXLEN 則）
+        _latest (Optional[tuple]): 最新的進度消息槽
+        _event (asyncio.Event): 有消息可取時設置
+    """
+
+    # 終端消息環形緩衝容量；與原 asyncio.Queue(maxsize=32) 持平
+    _MAXLEN = 32
+
+    def __init__(self) -> None:
+        self._terminal: deque = deque(maxlen=self._MAXLEN)
+        self._latest: Optional[tuple] = None
+        self._event = asyncio.Event()
+
+    def put_nowait(self, payload: tuple) -> None:
+        """
+        放入消息；進度消息覆蓋既有槽位，終端消息附加排隊。
+
+        同頻道的終端消息會丟棄槽中待送的進度：終端先送、舊進度後送
+        會讓客戶端在「完成」之後套用過時進度（進度條倒退），而該
+        進度本來就已被終端狀態取代。
+
+        Args:
+            payload (tuple): (消息字典, 預序列化的 JSON 字串)
+        """
+        if payload[0].get("stage") in _TERMINAL_STAGES:
+            if (
+                self._latest is not None
+                and self._latest[0].get("channel") == payload[0].get("channel")
+            ):
+                self._latest = None
+            self._terminal.append(payload)
+        else:
+            self._latest = payload
+        self._event.set()
+
+    async def get(self) -> tuple:
+        """
+        取出下一則消息；終端消息優先，其次為最新進度。
+
+        Returns:
+            tuple: (消息字典, 預序列化的 JSON 字串)
+        """
+        while True:
+            await self._event.wait()
+            if self._terminal:
+                payload: Optional[tuple] = self._terminal.popleft()
+            else:
+                payload = self._latest
+                self._latest = None
+            if not self._terminal and self._latest is None:
+                self._event.clear()
+            if payload is not None:
+                return payload
+
+    async def get_batch(self, max_batch: int = 32) -> list:
+        """
+        取出一批待送消息；至少一則，至多 max_batch 則。
+
+        先等到有消息可取，再把當下累積的終端消息與最新進度一次取空，
+        讓發送端以單一 WebSocket 幀送出整批，取代逐則發送的幀與
+        系統呼叫開銷。
+
+        Args:
+            max_batch (int): 單批最大消息數
+
+        Returns:
+            list: (消息字典, 預序列化的 JSON 字串) 元組列表
+        """
+        batch = [await self.get()]
+        while len(batch) < max_batch:
+            if self._terminal:
+                batch.append(self._terminal.popleft())
+            elif self._latest is not None:
+                batch.append(self._latest)
+                self._latest = None
+            else:
+                break
+        if not self._terminal and self._latest is None:
+            self._event.clear()
+        return batch
+
+
 class StatusBroadcaster:
     """
     非同步發布-訂閱輔助類別，用於向WebSocket客戶端推送狀態更新。
@@ -72,20 +336,26 @@ class StatusBroadcaster:
     支持多個客戶端同時接收狀態更新，並自動清理斷開的連接。
 
     Attributes:
-        _connections (set[asyncio.Queue]): 活躍的WebSocket連接隊列集合
-        _lock (asyncio.Lock): 非同步鎖，用於保護連接集合的線程安全
+        _connections (list[LatestQueue]): 活躍的WebSocket連接通道列表
+        _lock (asyncio.Lock): 非同步鎖，用於保護連接列表的線程安全
         _loop (Optional[asyncio.AbstractEventLoop]): 事件循環引用
+        _last_emit (Dict[tuple, float]): 各 (channel, stage) 最近發送時間
     """
 
+    # 節流參數：非終端狀態消息的最小發送間隔（秒）
+    _COALESCE_INTERVAL = 0.1
+
     def __init__(self) -> None:
         """
         初始化StatusBroadcaster實例。
 
-        建立空的連接集合和非同步鎖，為狀態廣播做準備。
+        建立空的連接列表和非同步鎖，為狀態廣播做準備。
         """
-        self._connections: set[asyncio.Queue] = set()
+        self._connections: list[LatestQueue] = []
         self._lock = asyncio.Lock()
         self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # 各 (channel, stage) 最近一次發送時間，用於合併高頻進度消息
+        self._last_emit: Dict[tuple, float] = {}
 
     def set_loop(self, loop: asyncio.AbstractEventLoop) -> None:
         """
@@ -96,48 +366,59 @@ class StatusBroadcaster:
         """
         self._loop = loop
 
-    async def register(self) -> asyncio.Queue:
+    async def register(self) -> LatestQueue:
         """
-        註冊新的WebSocket連接並返回消息隊列。
+        註冊新的WebSocket連接並返回消息通道。
 
-        建立新的非同步隊列並添加到活躍連接集合中，用於接收廣播消息。
+        建立新的 latest-value 通道並添加到活躍連接列表中，用於接收廣播消息。
 
         Returns:
-            asyncio.Queue: 新建立的消息隊列，最大容量32條消息
+            LatestQueue: 新建立的消息通道
         """
-        queue: asyncio.Queue = asyncio.Queue(maxsize=32)
+        queue = LatestQueue()
         async with self._lock:
-            self._connections.add(queue)
+            self._connections.append(queue)
         return queue
 
-    async def unregister(self, queue: asyncio.Queue) -> None:
+    async def unregister(self, queue: LatestQueue) -> None:
         """
-        從活躍連接集合中移除指定的消息隊列。
+        從活躍連接列表中移除指定的消息隊列。
 
         Args:
-            queue (asyncio.Queue): 要移除的消息隊列
+            queue (LatestQueue): 要移除的消息通道
         """
         async with self._lock:
-            self._connections.discard(queue)
+            self._swap_pop(queue)
+
+    def _swap_pop(self, queue: LatestQueue) -> None:
+        """
+        以 swap-and-pop 方式自連接列表移除通道（O(1) 移除，不保序）。
+
+        Args:
+            queue (LatestQueue): 要移除的消息通道
+        """
+        try:
+            index = self._connections.index(queue)
+        except ValueError:
+            return
+        self._connections[index] = self._connections[-1]
+        self._connections.pop()
 
     async def broadcast(self, message: Dict[str, Any]) -> None:
         """
         向所有活躍的WebSocket連接廣播消息。
 
-        遍歷所有連接隊列，嘗試發送消息。對於已滿或斷開的隊列進行清理。
+        遍歷所有連接通道投遞消息；LatestQueue 永遠不會滿，
+        斷開的連接由 unregister 負責移除。
 
         Args:
             message (Dict[str, Any]): 要廣播的消息字典
         """
+        # 每則消息只序列化一次，所有客戶端共用同一 JSON 字串
+        payload = (message, _dumps_message(message))
         async with self._lock:
-            dead = []
-            for queue in list(self._connections):
-                try:
-                    queue.put_nowait(message)
-                except asyncio.QueueFull:
-                    dead.append(queue)
-            for queue in dead:
-                self._connections.discard(queue)
+            for queue in self._connections:
+                queue.put_nowait(payload)
 
     def _ensure_loop(self) -> Optional[asyncio.AbstractEventLoop]:
         """
@@ -158,19 +439,62 @@ class StatusBroadcaster:
             self._loop = loop
         return loop
 
+    def _fanout(self, message: Dict[str, Any]) -> None:
+        """
+        在事件循環線程上同步分發消息。
+
+        所有連接列表變更都發生在循環線程上，因此不需要非同步鎖；
+        LatestQueue 投遞不會失敗，斷開的連接由 unregister 移除。
+
+        Args:
+            message (Dict[str, Any]): 要廣播的消息字典
+        """
+        # 每則消息只序列化一次，所有客戶端共用同一 JSON 字串
+        payload = (message, _dumps_message(message))
+        for queue in self._connections:
+            queue.put_nowait(payload)
+
     def broadcast_sync(self, message: Dict[str, Any]) -> None:
         """
         在同步上下文中廣播消息。
 
-        獲取事件循環並使用run_coroutine_threadsafe執行非同步廣播。
+        以call_soon_threadsafe將同步fan-out排入事件循環，
+        避免每則消息都付出協程排程與Future配置成本。
+        同一 (channel, stage, method, file) 的進度消息在 100 ms 內只發送
+        一次，避免高頻進度更新淹沒事件循環；鍵包含 method/file，
+        多方法並行處理時各自的進度（如 [2/N] 起始消息）不會被
+        互相吞掉；終端狀態（complete/error）不受節流。
 
         Args:
             message (Dict[str, Any]): 要廣播的消息字典
         """
+        stage = message.get("stage")
+        if stage in _TERMINAL_STAGES:
+            # 終端狀態代表該檔案的這條處理流程已結束，順手移除對應的
+            # 節流紀錄；file 每個請求都不同，不清的話 _last_emit 會隨
+            # 處理過的影片數無上限增長
+            channel = message.get("channel")
+            file = message.get("file")
+            for key in [
+                k for k in self._last_emit if k[0] == channel and k[3] == file
+            ]:
+                del self._last_emit[key]
+        else:
+            key = (
+                message.get("channel"),
+                stage,
+                message.get("method"),
+                message.get("file"),
+            )
+            now = time.monotonic()
+            if now - self._last_emit.get(key, 0.0) < self._COALESCE_INTERVAL:
+                return
+            self._last_emit[key] = now
+
         loop = self._ensure_loop()
         if not loop:
             return
-        asyncio.run_coroutine_threadsafe(self.broadcast(message), loop)
+        loop.call_soon_threadsafe(self._fanout, message)
 
     def broadcast_threadsafe(self, message: Dict[str, Any]) -> None:
         """
@@ -205,6 +529,19 @@ class VitalLensService:
         所有網路攝影機相關操作都在背景執行緒中執行。
     """
 
+    # 預先建立的狀態訊息模板，避免熱路徑上重組相同前綴字串
+    _START_TEMPLATE = "[{}/{}] 使用 {} 分析 {}"
+    _COMPLETE_TEMPLATE = "完成 {} 分析"
+    _ERROR_TEMPLATE = "{} 分析失敗: {}"
+
+    # 各波形面板的繪製規格：(資料鍵, (列, 欄), 標題, 預設單位)
+    _PLOT_SPEC = (
+        ("ppg_waveform", (0, 0), "PPG Waveform", ""),
+        ("respiratory_waveform", (0, 1), "Respiratory Waveform", ""),
+        ("rolling_heart_rate", (1, 0), "Rolling Heart Rate", "bpm"),
+        ("rolling_respiratory_rate", (1, 1), "Rolling Respiratory Rate", "rpm"),
+    )
+
     def __init__(self) -> None:
         """
         初始化 VitalLensService 實例。
@@ -226,6 +563,15 @@ class VitalLensService:
         """
         self.available_methods: Dict[str, Method] = self._discover_methods()
 
+        # 預先展開所有別名（顯示標籤、enum 名稱與各自的大寫形式），
+        # 讓 _resolve_method 成為單次 O(1) 查表
+        self._resolve_map: Dict[str, Method] = {}
+        for label, method in self.available_methods.items():
+            self._resolve_map[label] = method
+            self._resolve_map[label.upper()] = method
+            self._resolve_map[method.name] = method
+            self._resolve_map[method.name.upper()] = method
+
         self.default_api_key: str = os.getenv("VITALLENS_API_KEY", "")
         self.default_method: str = "POS (免費)"
         self.app_title: str = "VitalLens 生命體徵檢測器"
@@ -238,6 +584,27 @@ class VitalLensService:
         self._last_result: Optional[Dict[str, Optional[str]]] = None
         self._status_message = "準備開始錄影..."
         self._fps = 30
+        # rPPG 取的是臉部膚色像素的空間平均，人臉區域超過 ~96x96 的
+        # 解析度對訊號沒有貢獻；640x360 讓記憶體流量與編碼工作量
+        # 都降為 720p 的四分之一，VitalLens 在小影片上也跑得更快
+        self._capture_res = (640, 360)
+        # 錄影流程完成事件，供狀態端點長輪詢等待；初始為已完成
+        self._done = threading.Event()
+        self._done.set()
+        self._cached_camera_index: Optional[int] = None
+        self._preferred_fourcc: Optional[int] = None
+
+        # VitalLens 實例快取：建構時會載入人臉偵測模型，依 (method, api_key) 重用
+        self._vl_cache: Dict[tuple, tuple] = {}
+        self._vl_cache_lock = threading.Lock()
+
+        # 圖表渲染程序池（延遲建立），讓 CPU-bound 的 matplotlib 渲染跨核心並行
+        self._plot_pool: Optional[ProcessPoolExecutor] = None
+        self._plot_pool_lock = threading.Lock()
+
+        # 已建構圖形池：依人臉數重用 (fig, axes)，跳過重複的 subplot 建構
+        self._fig_cache: Dict[int, tuple] = {}
+        self._fig_cache_lock = threading.Lock()
 
     # ------------------------------------------------------------------
     # Video processing helpers
@@ -248,6 +615,7 @@ class VitalLensService:
         method_names: List[str],
         api_key: str,
         source: str = "upload",
+        include_plots: bool = True,
     ) -> Dict[str, Any]:
         """
         使用一個或多個檢測方法處理影片並返回結構化結果。
@@ -260,6 +628,8 @@ class VitalLensService:
             method_names (List[str]): 要使用的檢測方法名稱列表
             api_key (str): VitalLens API金鑰（某些方法需要）
             source (str, optional): 影片來源類型，預設為"upload"
+            include_plots (bool, optional): 是否生成可視化圖表，預設為True；
+                僅需數值指標的程式化呼叫端可關閉以跳過整個繪圖流程
 
         Returns:
             Dict[str, Any]: 包含處理狀態和結果的字典
@@ -297,13 +667,29 @@ class VitalLensService:
 
         self._validate_video_duration(video_path)
 
+        # 本地方法（POS/CHROM/G）對低解析度穩健，寬影片先縮小供其分析；
+        # VITALLENS 雲端方法仍收到原始影片，純 VITALLENS 請求直接跳過
+        # 轉檔，不白付一次 ffmpeg 重編碼。無法解析的方法名留給 _run_one
+        # 逐一報錯，此處不改變錯誤語意
+        def _wants_downscale(name: str) -> bool:
+            try:
+                return self._resolve_method(name) != Method.VITALLENS
+            except ValueError:
+                return False
+
+        analysis_path = (
+            self._maybe_downscale(video_path)
+            if any(_wants_downscale(name) for name in normalized_methods)
+            else video_path
+        )
+
         effective_api_key = api_key.strip() if api_key else self.default_api_key
         aggregated_results: List[Dict[str, Any]] = []
         errors: List[str] = []
 
         basename = os.path.basename(video_path)
 
-        for index, method_name in enumerate(normalized_methods, start=1):
+        def _run_one(index: int, method_name: str) -> tuple:
             method = self._resolve_method(method_name)
             if method == Method.VITALLENS and not effective_api_key:
                 raise ValueError("使用 VITALLENS 方法需要提供 API Key")
@@ -314,17 +700,17 @@ class VitalLensService:
                     "stage": "start",
                     "method": method_name,
                     "file": basename,
-                    "message": f"[{index}/{len(normalized_methods)}] 使用 {method_name} 分析 {basename}",
+                    "message": self._START_TEMPLATE.format(
+                        index, len(normalized_methods), method_name, basename
+                    ),
                 }
             )
 
             try:
-                vital_lens = (
-                    VitalLens(method=method, api_key=effective_api_key)
-                    if method == Method.VITALLENS
-                    else VitalLens(method=method)
-                )
-                result = vital_lens(video_path)
+                vital_lens, call_lock = self._get_vital_lens(method, effective_api_key)
+                input_path = video_path if method == Method.VITALLENS else analysis_path
+                with call_lock:
+                    result = vital_lens(input_path)
                 self._cleanup_vitallens_temp_files()
                 json_path = self._save_analysis_result(result, video_path, method_name, source)
 
@@ -336,7 +722,7 @@ class VitalLensService:
                         "Unable to detect valid facial data. Ensure the face is clear, lighting is good, "
                         "and the recording lasts at least 5 seconds."
                     )
-                    aggregated_results.append(
+                    return (
                         {
                             "file_name": basename,
                             "method": method_name,
@@ -348,29 +734,30 @@ class VitalLensService:
                             "metrics": {},
                             "raw_result": [],
                             "analysis_path": json_path,
-                        }
+                        },
+                        None,
                     )
-                    continue
 
                 metrics = self.extract_primary_metrics(result)
-                formatted_text = self.format_results(result)
-                plot_fig = self.create_plots(result)
-                plot_image = self.figure_to_base64(plot_fig)
-
-                aggregated_results.append(
-                    {
-                        "file_name": basename,
-                        "method": method_name,
-                        "display_name": f"{basename}（{method_name}）",
-                        "status": "Processing Complete!",
-                        "summary": self._build_summary(metrics, method_name),
-                        "result_text": formatted_text,
-                        "plot_image": plot_image,
-                        "metrics": metrics,
-                        "raw_result": self._ensure_serialisable(result),
-                        "analysis_path": json_path,
-                    }
+                # 攝影機來源的取樣率固定為服務 FPS，可附帶快速 FFT 心率檢核；
+                # 上傳影片的實際 FPS 未知，不做估計以免誤導
+                formatted_text = self.format_results(
+                    result, fps=self._fps if source == "webcam" else None
                 )
+                plot_image = self._render_plot(result) if include_plots else None
+
+                entry = {
+                    "file_name": basename,
+                    "method": method_name,
+                    "display_name": f"{basename}（{method_name}）",
+                    "status": "Processing Complete!",
+                    "summary": self._build_summary(metrics, method_name),
+                    "result_text": formatted_text,
+                    "plot_image": plot_image,
+                    "metrics": metrics,
+                    "raw_result": self._ensure_serialisable(result),
+                    "analysis_path": json_path,
+                }
 
                 status_broadcaster.broadcast_sync(
                     {
@@ -378,18 +765,21 @@ class VitalLensService:
                         "stage": "complete",
                         "method": method_name,
                         "file": basename,
-                        "message": f"完成 {method_name} 分析",
+                        "message": self._COMPLETE_TEMPLATE.format(method_name),
                     }
                 )
 
-            except Exception as exc:  # pylint: disable=broad-except
-                import traceback
+                return entry, None
 
-                error_traceback = traceback.format_exc()
-                print(f"詳細錯誤堆棧: {error_traceback}")
+            except Exception as exc:  # pylint: disable=broad-except
+                # 完整堆疊要走訪所有框架並經 linecache 取回原始碼，
+                # 生產環境只記一行摘要；除錯時以 VITALLENS_DEBUG 開啟
+                if os.getenv("VITALLENS_DEBUG"):
+                    print(f"詳細錯誤堆棧: {traceback.format_exc()}")
+                else:
+                    print(f"處理錯誤: {type(exc).__name__}: {exc}")
 
                 error_message = self._human_friendly_error(str(exc))
-                errors.append(error_message)
 
                 status_broadcaster.broadcast_sync(
                     {
@@ -397,11 +787,14 @@ class VitalLensService:
                         "stage": "error",
                         "method": method_name,
                         "file": basename,
-                        "message": f"{method_name} 分析失敗: {error_message}",
+                        "message": self._ERROR_TEMPLATE.format(method_name, error_message),
                     }
                 )
 
-                aggregated_results.append(
+                if os.getenv("TESTING", "").lower() == "true":
+                    raise
+
+                return (
                     {
                         "file_name": basename,
                         "method": method_name,
@@ -412,11 +805,30 @@ class VitalLensService:
                         "plot_image": None,
                         "metrics": {},
                         "raw_result": None,
-                    }
+                    },
+                    error_message,
                 )
 
-                if os.getenv("TESTING", "").lower() == "true":
-                    raise
+        # 各方法彼此獨立且主要耗時在釋放 GIL 的 C++ 推論，
+        # 以執行緒池並行處理；依提交順序收集以保持結果順序
+        max_workers = min(len(normalized_methods), os.cpu_count() or 1)
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(_run_one, index, method_name)
+                    for index, method_name in enumerate(normalized_methods, start=1)
+                ]
+                for future in futures:
+                    entry, error_message = future.result()
+                    aggregated_results.append(entry)
+                    if error_message:
+                        errors.append(error_message)
+        finally:
+            if analysis_path != video_path:
+                try:
+                    os.remove(analysis_path)
+                except OSError:
+                    pass
 
         overall_status = "Processing Complete!" if not errors else "Processing Completed With Errors"
 
@@ -429,6 +841,76 @@ class VitalLensService:
             "errors": errors,
         }
 
+    def warmup(self) -> None:
+        """
+        預熱本地方法的 VitalLens 實例快取。
+
+        VitalLens 建構與首次呼叫會載入人臉偵測模型並初始化解碼器，
+        冷啟動成本可達數秒；在啟動時以 2 秒的合成短片逐一跑過各
+        本地方法，把這筆成本移出第一個使用者請求。任何失敗都僅
+        略過該方法（例如缺少編碼器的環境）。
+        """
+        if os.getenv("TESTING", "").lower() == "true":
+            return
+
+        dummy_path = os.path.join(tempfile.gettempdir(), "vitallens_warmup.mp4")
+        try:
+            writer = cv2.VideoWriter(
+                dummy_path,
+                cv2.VideoWriter_fourcc(*"mp4v"),
+                30,
+                (64, 64),
+            )
+            blank = np.zeros((64, 64, 3), dtype=np.uint8)
+            for _ in range(60):
+                writer.write(blank)
+            writer.release()
+
+            for method in set(self.available_methods.values()):
+                if method == Method.VITALLENS:
+                    # 雲端方法的預熱會消耗 API 配額，不在此進行
+                    continue
+                try:
+                    vital_lens, call_lock = self._get_vital_lens(method, "")
+                    with call_lock:
+                        vital_lens(dummy_path)
+                except Exception:  # pylint: disable=broad-except
+                    # 合成短片沒有人臉，推論報錯是預期的；模型已載入
+                    continue
+        finally:
+            try:
+                os.remove(dummy_path)
+            except OSError:
+                pass
+
+    def _get_vital_lens(self, method: Method, api_key: str) -> tuple:
+        """
+        取得（必要時建構）指定方法的 VitalLens 實例。
+
+        VitalLens 建構時會重新載入人臉偵測模型權重（~100-500 ms），
+        因此依 (method, api_key) 快取實例重複使用。回傳的鎖用於
+        序列化對同一實例的呼叫，避免共享的每次呼叫狀態互相干擾。
+
+        Args:
+            method (Method): 檢測方法
+            api_key (str): API 金鑰（僅 VITALLENS 方法使用）
+
+        Returns:
+            tuple: (VitalLens 實例, threading.Lock)
+        """
+        cache_key = (method, api_key if method == Method.VITALLENS else "")
+        with self._vl_cache_lock:
+            cached = self._vl_cache.get(cache_key)
+            if cached is None:
+                instance = (
+                    VitalLens(method=method, api_key=api_key)
+                    if method == Method.VITALLENS
+                    else VitalLens(method=method)
+                )
+                cached = (instance, threading.Lock())
+                self._vl_cache[cache_key] = cached
+        return cached
+
     def _cleanup_vitallens_temp_files(self) -> None:
         """
         清理VitalLens函式庫在根目錄產生的臨時檔案。
@@ -440,15 +922,17 @@ class VitalLensService:
             此方法會靜默處理清理過程中的錯誤，不會中斷主要處理流程。
         """
         try:
-            import glob
-            # 清理根目錄中的 vitallens_*.json 檔案
-            temp_files = glob.glob("vitallens_*.json")
-            for temp_file in temp_files:
-                try:
-                    os.remove(temp_file)
-                    print(f"🗑️ 已清理臨時檔案: {temp_file}")
-                except Exception as e:
-                    print(f"⚠️ 清理檔案失敗 {temp_file}: {e}")
+            # 清理根目錄中的 vitallens_*.json 檔案；
+            # 以 scandir + 前綴/後綴檢查取代 glob，免去 fnmatch 與列表配置
+            with os.scandir(".") as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name.startswith("vitallens_") and name.endswith(".json"):
+                        try:
+                            os.unlink(entry.path)
+                            print(f"🗑️ 已清理臨時檔案: {name}")
+                        except OSError as e:
+                            print(f"⚠️ 清理檔案失敗 {name}: {e}")
         except Exception as e:
             print(f"⚠️ 清理過程出錯: {e}")
 
@@ -474,6 +958,10 @@ class VitalLensService:
         Returns:
             str: 保存的JSON檔案路徑，如果保存失敗則返回空字串
         """
+        # 測試模式不落地結果檔，避免每次跑測試都在 data/results/ 留下垃圾
+        if os.getenv("TESTING", "").lower() == "true":
+            return ""
+
         timestamp = _now_ts()
 
         # 根據視頻路徑判斷來源類型和存放目錄
@@ -508,14 +996,30 @@ class VitalLensService:
                 }
             }
 
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(
-                    self._ensure_serialisable(analysis_data),
-                    f,
-                    ensure_ascii=False,
-                    indent=2,
-                    default=str,
-                )
+            if orjson is not None:
+                # 單趟 C 層序列化，原生理解 numpy 陣列，
+                # 省去 _ensure_serialisable 的 Python 層預先遍歷
+                with open(json_path, "wb") as f:
+                    f.write(
+                        orjson.dumps(
+                            analysis_data,
+                            default=str,
+                            option=(
+                                orjson.OPT_SERIALIZE_NUMPY
+                                | orjson.OPT_INDENT_2
+                                | orjson.OPT_NON_STR_KEYS
+                            ),
+                        )
+                    )
+            else:
+                with open(json_path, 'w', encoding='utf-8') as f:
+                    json.dump(
+                        self._ensure_serialisable(analysis_data),
+                        f,
+                        ensure_ascii=False,
+                        indent=2,
+                        default=str,
+                    )
             print(f"✅ 分析結果已保存: {json_path}")
             return json_path
 
@@ -528,16 +1032,13 @@ class VitalLensService:
             raise ValueError("未知的檢測方法: 空值")
 
         normalized = method_name.strip()
-        if normalized in self.available_methods:
-            return self.available_methods[normalized]
-
-        upper_name = normalized.upper()
-        for label, method in self.available_methods.items():
-            if label.upper() == upper_name:
-                return method
+        try:
+            return self._resolve_map[normalized]
+        except KeyError:
+            pass
 
         try:
-            return Method[upper_name]
+            return self._resolve_map[normalized.upper()]
         except KeyError as exc:
             raise ValueError(f"未知的檢測方法: {method_name}") from exc
 
@@ -567,10 +1068,51 @@ class VitalLensService:
             return "G (免費)"
         return method.name
 
+    @staticmethod
+    def _probe_video_duration(video_path: str) -> Optional[float]:
+        """
+        以 ffprobe 讀取影片長度，不初始化完整解碼器。
+
+        只解析串流 metadata（約比開啟 cv2.VideoCapture 快一個數量級）；
+        ffprobe 不存在或輸出異常時返回 None，由呼叫端退回 OpenCV 路徑。
+
+        Args:
+            video_path (str): 影片檔案路徑
+
+        Returns:
+            Optional[float]: 影片長度（秒），無法取得時為 None
+        """
+        try:
+            output = subprocess.check_output(
+                [
+                    "ffprobe",
+                    "-v", "quiet",
+                    "-print_format", "json",
+                    "-show_streams",
+                    "-select_streams", "v:0",
+                    video_path,
+                ],
+                timeout=10,
+            )
+            streams = json.loads(output).get("streams", [])
+            if not streams:
+                return None
+            return float(streams[0]["duration"])
+        except (OSError, subprocess.SubprocessError, KeyError, ValueError):
+            return None
+
     def _validate_video_duration(self, video_path: str) -> None:
         if os.getenv("TESTING", "").lower() == "true":
             return
 
+        duration_seconds = self._probe_video_duration(video_path)
+        if duration_seconds is not None:
+            if duration_seconds > MAX_VIDEO_DURATION_SECONDS:
+                raise ValueError(
+                    f"影片長度不得超過 {MAX_VIDEO_DURATION_SECONDS} 秒 (目前約 {int(duration_seconds)} 秒)"
+                )
+            return
+
         capture = cv2.VideoCapture(video_path)
         if not capture.isOpened():
             capture.release()
@@ -587,29 +1129,94 @@ class VitalLensService:
                     f"影片長度不得超過 {MAX_VIDEO_DURATION_SECONDS} 秒 (目前約 {int(duration_seconds)} 秒)"
                 )
 
+    def _maybe_downscale(self, video_path: str) -> str:
+        """
+        寬度過大的影片先縮到 320 寬的暫存檔供本地方法分析。
+
+        rPPG 取臉部膚色像素的空間平均，POS/CHROM/G 對低解析度穩健；
+        1080p 輸入縮到 320 寬後每幀資料量約降九倍，解碼與人臉偵測
+        成本同步下降。ffmpeg 不存在或轉檔失敗時返回原始路徑。
+
+        Args:
+            video_path (str): 原始影片檔案路徑
+
+        Returns:
+            str: 縮圖後的暫存檔路徑；不需要或無法縮圖時為原始路徑
+        """
+        if os.getenv("TESTING", "").lower() == "true":
+            return video_path
+
+        capture = cv2.VideoCapture(video_path)
+        width = capture.get(cv2.CAP_PROP_FRAME_WIDTH) or 0.0
+        capture.release()
+        if width <= 480:
+            return video_path
+
+        scaled_path = tempfile.NamedTemporaryFile(suffix=".mp4", delete=False).name
+        try:
+            subprocess.run(
+                [
+                    "ffmpeg", "-y", "-v", "quiet",
+                    "-i", video_path,
+                    "-vf", "scale=320:-2",
+                    "-an",
+                    "-c:v", "libx264",
+                    "-preset", "ultrafast",
+                    "-crf", "28",
+                    scaled_path,
+                ],
+                check=True,
+                timeout=60,
+            )
+            return scaled_path
+        except (OSError, subprocess.SubprocessError):
+            try:
+                os.remove(scaled_path)
+            except OSError:
+                pass
+            return video_path
+
     # ------------------------------------------------------------------
     # Webcam helpers
     # ------------------------------------------------------------------
-    @staticmethod
-    def _find_available_camera_index(max_index: int = 5) -> Optional[int]:
-        error_messages: List[str] = []
-        for cam_index in range(max_index):
+    def _find_available_camera_index(self, max_index: int = 5) -> Optional[int]:
+        # 快取命中時只做一次便宜的 isOpened 驗證，避免每次錄影重付探測成本
+        if self._cached_camera_index is not None:
+            cap = cv2.VideoCapture(self._cached_camera_index)
+            try:
+                if cap.isOpened():
+                    return self._cached_camera_index
+            finally:
+                cap.release()
+            self._cached_camera_index = None
+
+        def _probe(cam_index: int) -> Optional[str]:
             cap = None
             try:
                 cap = cv2.VideoCapture(cam_index)
                 if cap.isOpened():
                     ret, _ = cap.read()
                     if ret:
-                        return cam_index
-                    error_messages.append(f"攝影機 {cam_index}: 無法讀取影格")
-                else:
-                    error_messages.append(f"攝影機 {cam_index}: 無法開啟")
+                        return None
+                    return f"攝影機 {cam_index}: 無法讀取影格"
+                return f"攝影機 {cam_index}: 無法開啟"
             except Exception as exc:  # pylint: disable=broad-except
-                error_messages.append(f"攝影機 {cam_index}: {exc}")
+                return f"攝影機 {cam_index}: {exc}"
             finally:
                 if cap is not None:
                     cap.release()
 
+        # 冷啟動時並行探測各裝置（單一裝置開啟可達數百毫秒）
+        max_workers = min(max_index, os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            outcomes = list(executor.map(_probe, range(max_index)))
+
+        error_messages = [message for message in outcomes if message]
+        for cam_index, message in enumerate(outcomes):
+            if message is None:
+                self._cached_camera_index = cam_index
+                return cam_index
+
         if error_messages:
             print("攝影機檢查失敗詳情:\n" + "\n".join(error_messages))
         return None
@@ -635,6 +1242,7 @@ class VitalLensService:
                 raise RuntimeError("無法開啟網路攝影機")
 
             self._is_recording = True
+            self._done.clear()
             self._status_message = f"開始錄影 {duration_value} 秒..."
             # 確保影片目錄存在
             os.makedirs("data/videos", exist_ok=True)
@@ -728,6 +1336,8 @@ class VitalLensService:
                         error_messages.append(f"攝影機 {cam_index}: {str(e)}")
 
             if not camera_found:
+                # 探測失敗時讓快取失效，下次重新冷啟動探測
+                self._cached_camera_index = None
                 # 檢查系統上的攝影機設備
                 import os
                 video_devices = []
@@ -739,91 +1349,163 @@ class VitalLensService:
                 full_error = f"無法開啟網路攝影機\n{device_info}\n錯誤詳情:\n" + "\n".join(error_messages)
                 raise RuntimeError(full_error)
 
-            # 設定較高解析度並保持比例
-            cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
-            cap.set(cv2.CAP_PROP_FPS, self._fps)
+            if not self._output_video_path:
+                raise RuntimeError("找不到輸出檔案路徑")
 
-            # 檢查實際解析度
-            actual_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            actual_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            print(f"📹 Webcam resolution: {actual_width}x{actual_height}")
+            frame_count = len(frames)
 
-            frames = []
             if not is_testing:
-                start_time = time.time()
+                # 先要求 MJPG 再設定解析度（V4L2 對設定順序敏感）：
+                # 未壓縮 YUYV 在 USB 2.0 頻寬下 720p 往往只剩約 10 FPS，
+                # MJPG 才能實際供應 30 FPS 給 rPPG 頻譜分析
+                cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+                capture_width, capture_height = self._capture_res
+                cap.set(cv2.CAP_PROP_FRAME_WIDTH, capture_width)
+                cap.set(cv2.CAP_PROP_FRAME_HEIGHT, capture_height)
+                cap.set(cv2.CAP_PROP_FPS, self._fps)
+                # 只保留單格驅動佇列：若處理一度落後，grab 取得的是
+                # 最新影格而非累積數秒的舊幀（部分後端不支援時靜默忽略）
+                cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+                # 自動曝光會隨場景亮度調變膚色像素強度、污染 PPG 波形；
+                # 光源穩定的部署環境可透過環境變數鎖定曝光
+                if os.getenv("WEBCAM_LOCK_EXPOSURE", "").lower() == "true":
+                    cap.set(cv2.CAP_PROP_AUTO_EXPOSURE, 0.25)
+
+                # 檢查實際解析度與像素格式
+                actual_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+                actual_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+                fourcc_value = int(cap.get(cv2.CAP_PROP_FOURCC))
+                fourcc_name = "".join(
+                    chr((fourcc_value >> shift) & 0xFF) for shift in (0, 8, 16, 24)
+                )
+                print(
+                    f"📹 Webcam resolution: {actual_width}x{actual_height}"
+                    f" ({fourcc_name.strip()})"
+                )
 
-                while True:
-                    with self._lock:
-                        if not self._is_recording:
+                # 逐幀串流寫入編碼器，避免整段錄影駐留記憶體後再二次遍歷編碼
+                fourcc = self._select_fourcc(actual_width, actual_height)
+                writer = cv2.VideoWriter(
+                    self._output_video_path, fourcc, self._fps, (actual_width, actual_height)
+                )
+                total_frames = target_duration * self._fps
+                # monotonic 時鐘不受系統時間調整影響，排程期限不會跳動
+                start_time = time.monotonic()
+
+                # 捕捉與編碼以有界佇列解耦：寫檔延遲由編碼執行緒吸收，
+                # 不會拖慢捕捉節拍。緩衝區採環池重用（retrieve 解碼進
+                # scratch，鏡像寫入自由池取得的緩衝區），熱迴圈零配置；
+                # 編碼嚴重落後、池耗盡時丟幀而非累積延遲
+                scratch = np.empty((actual_height, actual_width, 3), dtype=np.uint8)
+                free_buffers: queue.Queue = queue.Queue()
+                for _ in range(8):
+                    free_buffers.put_nowait(np.empty_like(scratch))
+                frame_q: queue.Queue = queue.Queue(maxsize=8)
+
+                def _encode_frames() -> None:
+                    while True:
+                        buffer = frame_q.get()
+                        if buffer is None:
                             break
+                        writer.write(buffer)
+                        free_buffers.put_nowait(buffer)
 
-                    if time.time() - start_time >= target_duration:
-                        break
+                encoder = threading.Thread(target=_encode_frames, daemon=True)
+                encoder.start()
 
-                    success, frame = cap.read()
-                    if not success:
-                        continue
-                    # 水平翻轉以提供鏡像效果，更符合使用者習慣
-                    frame = cv2.flip(frame, 1)
-                    frames.append(frame.copy() if hasattr(frame, "copy") else frame)
-                    time.sleep(1 / self._fps)
+                try:
+                    for frame_index in range(total_frames):
+                        with self._lock:
+                            if not self._is_recording:
+                                break
+
+                        success = cap.grab()
+                        if success:
+                            success, frame = cap.retrieve(scratch)
+                        if success and frame is not None and frame.shape == scratch.shape:
+                            try:
+                                mirrored = free_buffers.get_nowait()
+                            except queue.Empty:
+                                mirrored = None
+                            if mirrored is not None:
+                                # 水平翻轉以提供鏡像效果，更符合使用者習慣；
+                                # cv2.flip 以 dst 參數直接寫入預配置緩衝區，
+                                # 整個翻轉在 C 層單趟完成、無中間配置
+                                cv2.flip(frame, 1, dst=mirrored)
+                                frame_q.put(mirrored)
+                                frame_count += 1
+
+                        # 以絕對期限排程取代固定 sleep，避免累積漂移拖慢實際 FPS
+                        deadline = start_time + (frame_index + 1) / self._fps
+                        remaining = deadline - time.monotonic()
+                        if remaining > 0:
+                            time.sleep(remaining)
+                finally:
+                    frame_q.put(None)
+                    encoder.join()
+                    writer.release()
+
+                # 看門狗：實際幀數遠低於目標代表攝影機供幀不足
+                # （常見於 USB 2.0 頻寬限制或低光自動降速），
+                # 明確警告以免使用者誤以為取得了設定的取樣率
+                if frame_count < 0.9 * total_frames:
+                    print(
+                        f"⚠️ 攝影機僅供應 {frame_count}/{total_frames} 幀"
+                        f"（約 {frame_count / max(target_duration, 1):.1f} FPS），"
+                        "低於設定的取樣率，心率頻譜解析度可能受影響"
+                    )
 
             if cap is not None:
                 cap.release()
 
-            if not frames:
+            if frame_count == 0:
                 raise RuntimeError("未捕捉到任何畫面，請檢查攝影機")
 
-            print(f"📽️ Captured {len(frames)} frames")
+            print(f"📽️ Captured {frame_count} frames")
             status_broadcaster.broadcast_threadsafe(
                 {
                     "channel": "webcam",
                     "stage": "captured",
-                    "message": f"已捕捉 {len(frames)} 幀，開始分析...",
+                    "message": f"已捕捉 {frame_count} 幀，開始分析...",
                 }
             )
 
-            if self._output_video_path:
-                if is_testing:
-                    Path(self._output_video_path).parent.mkdir(parents=True, exist_ok=True)
-                    with open(self._output_video_path, "wb") as handle:
-                        handle.write(b"TEST")
-                    result = {
-                        "status": "Processing Complete!",
-                        "result_text": "Testing mode: analysis skipped.",
-                        "plot_image": None,
-                        "metrics": {
-                            "heart_rate": {"value": 72, "unit": "BPM"},
-                            "respiratory_rate": {"value": 16, "unit": "RPM"},
-                        },
-                    }
-                else:
-                    self._save_video(frames, self._output_video_path)
-                    print(f"💾 Video saved to: {self._output_video_path}")
-                    payload = self.process_video(
-                        self._output_video_path,
-                        [method_name],
-                        api_key,
-                        source="webcam",
-                    )
-                    results_list = payload.get("results", [])
-                    first_result = results_list[0] if results_list else {}
-                    result = {
-                        "status": first_result.get("status", payload.get("status", "處理完成！")),
-                        "result_text": first_result.get("result_text"),
-                        "plot_image": first_result.get("plot_image"),
-                        "metrics": first_result.get("metrics"),
-                    }
-                    status_broadcaster.broadcast_threadsafe(
-                        {
-                            "channel": "webcam",
-                            "stage": "complete",
-                            "message": "攝影機影片分析完成",
-                        }
-                    )
+            if is_testing:
+                Path(self._output_video_path).parent.mkdir(parents=True, exist_ok=True)
+                with open(self._output_video_path, "wb") as handle:
+                    handle.write(b"TEST")
+                result = {
+                    "status": "Processing Complete!",
+                    "result_text": "Testing mode: analysis skipped.",
+                    "plot_image": None,
+                    "metrics": {
+                        "heart_rate": {"value": 72, "unit": "BPM"},
+                        "respiratory_rate": {"value": 16, "unit": "RPM"},
+                    },
+                }
             else:
-                raise RuntimeError("找不到輸出檔案路徑")
+                print(f"💾 Video saved to: {self._output_video_path}")
+                payload = self.process_video(
+                    self._output_video_path,
+                    [method_name],
+                    api_key,
+                    source="webcam",
+                )
+                results_list = payload.get("results", [])
+                first_result = results_list[0] if results_list else {}
+                result = {
+                    "status": first_result.get("status", payload.get("status", "處理完成！")),
+                    "result_text": first_result.get("result_text"),
+                    "plot_image": first_result.get("plot_image"),
+                    "metrics": first_result.get("metrics"),
+                }
+                status_broadcaster.broadcast_threadsafe(
+                    {
+                        "channel": "webcam",
+                        "stage": "complete",
+                        "message": "攝影機影片分析完成",
+                    }
+                )
 
             with self._lock:
                 self._last_result = result
@@ -847,183 +1529,399 @@ class VitalLensService:
         finally:
             with self._lock:
                 self._is_recording = False
+            # 喚醒長輪詢中的狀態端點，完成通知近乎即時
+            self._done.set()
 
-    def _save_video(self, frames: list[np.ndarray], output_path: str) -> None:
-        if os.getenv("TESTING", "").lower() == "true":
-            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-            with open(output_path, "wb") as handle:
-                handle.write(b"TEST")
-            return
+    def wait_for_completion(self, timeout: float = 5.0) -> bool:
+        """
+        等待當前錄影流程結束；沒有進行中的錄影時立即返回。
+
+        Args:
+            timeout (float): 最長等待秒數
 
-        height, width, _ = frames[0].shape
-        fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-        writer = cv2.VideoWriter(output_path, fourcc, self._fps, (width, height))
-        for frame in frames:
-            writer.write(frame)
-        writer.release()
+        Returns:
+            bool: 流程已結束（或原本就沒有錄影）時為 True
+        """
+        return self._done.wait(timeout)
+
+    def _select_fourcc(self, width: int, height: int) -> int:
+        """
+        挑選可用的影片編碼器 fourcc，優先使用 H.264 (avc1)。
+
+        avc1 會分派到平台的 H.264 編碼器（有硬體加速時直接使用硬體），
+        相較純 CPU 的 mp4v 可明顯降低編碼負載並縮小檔案；
+        若該編碼器不可用則退回 mp4v。探測結果快取於服務實例。
+
+        部署環境可透過 VIDEO_CODEC 環境變數指定優先嘗試的 fourcc
+        （如 "h264"），並以 OPENCV_FFMPEG_WRITER_OPTIONS 把編碼交給
+        NVENC / VideoToolbox / QSV 等硬體編碼器（OpenCV FFmpeg 後端
+        原生支援該變數）；指定的編碼器開不了時照樣走既有回退鏈。
+
+        Args:
+            width (int): 影格寬度
+            height (int): 影格高度
+
+        Returns:
+            int: 可用的 fourcc 編碼
+        """
+        if self._preferred_fourcc is not None:
+            return self._preferred_fourcc
+
+        probe_path = os.path.join(tempfile.gettempdir(), "vitallens_codec_probe.mp4")
+        candidates = ("avc1", "mp4v")
+        override = os.getenv("VIDEO_CODEC", "").strip()
+        if len(override) == 4:
+            candidates = (override, *candidates)
+        for codec in candidates:
+            fourcc = cv2.VideoWriter_fourcc(*codec)
+            writer = cv2.VideoWriter(probe_path, fourcc, self._fps, (width, height))
+            opened = writer.isOpened()
+            writer.release()
+            if opened:
+                print(f"🎞️ 使用影片編碼器: {codec}")
+                self._preferred_fourcc = fourcc
+                break
+        else:
+            self._preferred_fourcc = cv2.VideoWriter_fourcc(*"mp4v")
+
+        try:
+            os.remove(probe_path)
+        except OSError:
+            pass
+        return self._preferred_fourcc
 
     # ------------------------------------------------------------------
     # Result formatting helpers
     # ------------------------------------------------------------------
-    def format_results(self, results: Optional[list]) -> str:
+    def format_results(self, results: Optional[list], fps: Optional[float] = None) -> str:
         if not results:
             return "No detection results"
 
+        # 取樣率已知時（攝影機來源），將全部臉孔的 PPG 堆疊後以單次
+        # 批次 rFFT 做快速心率交叉檢核，頻譜成本與臉數無關
+        hr_estimates: Optional[np.ndarray] = None
+        if fps:
+            ppg_list = [
+                self._coerce_waveform(
+                    face.get("vital_signs", {}).get("ppg_waveform", {}).get("data", [])
+                )
+                for face in results
+                if isinstance(face, dict)
+            ]
+            max_len = max((ppg.size for ppg in ppg_list), default=0)
+            if max_len > 0 and len(ppg_list) == len(results):
+                stacked = np.zeros((len(ppg_list), max_len), dtype=np.float32)
+                for row, ppg in enumerate(ppg_list):
+                    stacked[row, : ppg.size] = ppg
+                hr_estimates = _batch_hr(stacked, fps)
+
+        # 每個段落以單一 f-string 組裝（先綁定 locals 減少重複的 dict 查找），
+        # 每張臉只對輸出列表 append 數次而非十餘次
         formatted_text = []
+        append = formatted_text.append
         for idx, face_result in enumerate(results, start=1):
-            formatted_text.append(f"=== Face {idx} ===\n")
-
             face_info = face_result.get("face", {})
-            formatted_text.append(f"Face Confidence: {face_info.get('note', 'Unknown')}\n\n")
-
             vital_signs = face_result.get("vital_signs", {})
 
+            append(
+                f"=== Face {idx} ===\n"
+                f"Face Confidence: {face_info.get('note', 'Unknown')}\n\n"
+            )
+
             if "heart_rate" in vital_signs:
                 hr = vital_signs["heart_rate"]
-                formatted_text.append(
-                    f"Heart Rate: {hr.get('value', 'N/A')} {hr.get('unit', 'bpm')}\n"
+                hr_value = hr.get("value", "N/A")
+                hr_unit = hr.get("unit", "bpm")
+                hr_confidence = hr.get("confidence", "N/A")
+                hr_note = hr.get("note", "")
+                append(
+                    f"Heart Rate: {hr_value} {hr_unit}\n"
+                    f"HR Confidence: {hr_confidence}\n"
+                    f"Note: {hr_note}\n\n"
                 )
-                formatted_text.append(f"HR Confidence: {hr.get('confidence', 'N/A')}\n")
-                formatted_text.append(f"Note: {hr.get('note', '')}\n\n")
 
             if "respiratory_rate" in vital_signs:
                 rr = vital_signs["respiratory_rate"]
-                formatted_text.append(
-                    f"Respiratory Rate: {rr.get('value', 'N/A')} {rr.get('unit', 'rpm')}\n"
+                rr_value = rr.get("value", "N/A")
+                rr_unit = rr.get("unit", "rpm")
+                rr_confidence = rr.get("confidence", "N/A")
+                rr_note = rr.get("note", "")
+                append(
+                    f"Respiratory Rate: {rr_value} {rr_unit}\n"
+                    f"RR Confidence: {rr_confidence}\n"
+                    f"Note: {rr_note}\n\n"
                 )
-                formatted_text.append(f"RR Confidence: {rr.get('confidence', 'N/A')}\n")
-                formatted_text.append(f"Note: {rr.get('note', '')}\n\n")
 
+            # 每條波形只轉換成 ndarray 一次，供 len/mean 共用，並寫回
+            # vital_signs 讓後續 create_plots 直接重用已轉換的陣列
             if "ppg_waveform" in vital_signs:
-                ppg = vital_signs["ppg_waveform"].get("data", [])
-                if ppg is not None and len(ppg) > 0:
-                    formatted_text.append(f"PPG Waveform: {len(ppg)} data points\n\n")
+                ppg_entry = vital_signs["ppg_waveform"]
+                ppg = self._coerce_waveform(ppg_entry.get("data", []))
+                if ppg.size > 0:
+                    ppg_entry["data"] = ppg
+                    append(f"PPG Waveform: {ppg.size} data points\n\n")
+                    if hr_estimates is not None and not np.isnan(hr_estimates[idx - 1]):
+                        append(f"FFT HR Estimate: {hr_estimates[idx - 1]:.1f} bpm\n\n")
 
             if "respiratory_waveform" in vital_signs:
-                resp = vital_signs["respiratory_waveform"].get("data", [])
-                if resp is not None and len(resp) > 0:
-                    formatted_text.append(f"Respiratory Waveform: {len(resp)} data points\n\n")
+                resp_entry = vital_signs["respiratory_waveform"]
+                resp = self._coerce_waveform(resp_entry.get("data", []))
+                if resp.size > 0:
+                    resp_entry["data"] = resp
+                    append(f"Respiratory Waveform: {resp.size} data points\n\n")
 
             if "rolling_heart_rate" in vital_signs:
-                rhr = vital_signs["rolling_heart_rate"].get("data", [])
-                if rhr is not None and len(rhr) > 0:
-                    formatted_text.append(
-                        f"Rolling Heart Rate: {len(rhr)} data points\nAverage HR: {np.mean(rhr):.1f} {vital_signs['rolling_heart_rate'].get('unit', 'bpm')}\n\n"
+                rolling_hr = vital_signs["rolling_heart_rate"]
+                rhr = self._coerce_waveform(rolling_hr.get("data", []))
+                if rhr.size > 0:
+                    rolling_hr["data"] = rhr
+                    append(
+                        f"Rolling Heart Rate: {rhr.size} data points\n"
+                        f"Average HR: {_series_mean(rhr):.1f} {rolling_hr.get('unit', 'bpm')}\n\n"
                     )
 
             if "rolling_respiratory_rate" in vital_signs:
-                rrr = vital_signs["rolling_respiratory_rate"].get("data", [])
-                if rrr is not None and len(rrr) > 0:
-                    formatted_text.append(
-                        f"Rolling Respiratory Rate: {len(rrr)} data points\nAverage RR: {np.mean(rrr):.1f} {vital_signs['rolling_respiratory_rate'].get('unit', 'rpm')}\n\n"
+                rolling_rr = vital_signs["rolling_respiratory_rate"]
+                rrr = self._coerce_waveform(rolling_rr.get("data", []))
+                if rrr.size > 0:
+                    rolling_rr["data"] = rrr
+                    append(
+                        f"Rolling Respiratory Rate: {rrr.size} data points\n"
+                        f"Average RR: {_series_mean(rrr):.1f} {rolling_rr.get('unit', 'rpm')}\n\n"
                     )
 
             if "message" in face_result:
-                formatted_text.append(f"System Message: {face_result['message']}\n\n")
+                append(f"System Message: {face_result['message']}\n\n")
 
         return "".join(formatted_text)
 
+    @staticmethod
+    def _coerce_waveform(data: Any) -> np.ndarray:
+        """
+        將波形資料統一轉換為 float32 ndarray。
+
+        資料偶爾以字串形式出現（序列化過的列表）；以 C 層的 JSON 解析
+        取代逐節點的 ast.literal_eval（後者對萬點波形要數十毫秒），
+        無括號的逗號分隔字串亦可解析。無法解析時返回空陣列。
+
+        Args:
+            data: 波形資料（list、ndarray 或字串）
+
+        Returns:
+            np.ndarray: 一維 float32 陣列，無資料時為空陣列
+        """
+        if data is None:
+            return np.empty(0, dtype=np.float32)
+
+        if isinstance(data, str):
+            cleaned = data.replace("\n", " ").strip()
+            # 空字串直接短路，不進入解析與例外回退路徑
+            if not cleaned:
+                return np.empty(0, dtype=np.float32)
+            loads = orjson.loads if orjson is not None else json.loads
+            try:
+                return np.asarray(loads(cleaned), dtype=np.float32)
+            except Exception:  # pylint: disable=broad-except
+                pass
+            try:
+                return np.fromiter(
+                    (
+                        float(token)
+                        for token in cleaned.strip("[] ").split(",")
+                        if token.strip()
+                    ),
+                    dtype=np.float32,
+                )
+            except ValueError:
+                return np.empty(0, dtype=np.float32)
+
+        try:
+            return np.asarray(data, dtype=np.float32).reshape(-1)
+        except (TypeError, ValueError):
+            return np.empty(0, dtype=np.float32)
+
+    # 圖形池容量上限：不同人臉數的已建構圖形最多保留這麼多組
+    _FIG_CACHE_MAX = 4
+
+    def _acquire_figure(self, num_faces: int) -> tuple:
+        """
+        自圖形池取出（或建構）對應人臉數的 (fig, axes)。
+
+        subplot 建構（axes spine/tick 設定）是 create_plots 的主要固定
+        成本；池中圖形以 ax.cla() 清空後重用。取出即自池中移除，
+        因此並行請求不會共用同一張圖。
+
+        Args:
+            num_faces (int): 結果中的人臉數
+
+        Returns:
+            tuple: (Figure, axes 陣列)
+        """
+        with self._fig_cache_lock:
+            cached = self._fig_cache.pop(num_faces, None)
+
+        if cached is not None:
+            fig, axes = cached
+            for axis in axes.flat:
+                axis.cla()
+            return fig, axes
+
+        # constrained layout 在渲染時計算版面，省去每次輸出前的
+        # tight_layout / bbox_inches="tight" 全圖重算；版面狀態也會
+        # 跟著圖形池一起跨請求保留
+        fig, axes = plt.subplots(
+            2 * num_faces, 2, figsize=(14, 6 * num_faces), layout="constrained"
+        )
+        if num_faces == 1:
+            axes = axes.reshape(2, 2)
+        # 記錄池鍵供 _recycle_figure 歸還使用
+        fig._vl_pool_entry = (num_faces, axes)  # pylint: disable=protected-access
+        return fig, axes
+
+    def _recycle_figure(self, fig) -> None:
+        """
+        將用畢的圖形歸還圖形池；池滿或非池圖形則直接關閉。
+
+        Args:
+            fig: 先前由 _acquire_figure 取得的 Figure
+        """
+        entry = getattr(fig, "_vl_pool_entry", None)
+        if entry is not None:
+            num_faces, axes = entry
+            with self._fig_cache_lock:
+                if (
+                    num_faces not in self._fig_cache
+                    and len(self._fig_cache) < self._FIG_CACHE_MAX
+                ):
+                    self._fig_cache[num_faces] = (fig, axes)
+                    return
+        plt.close(fig)
+
     def create_plots(self, results: Optional[list]):
         if not results:
             return None
 
-        num_faces = len(results)
-        fig, axes = plt.subplots(2 * num_faces, 2, figsize=(14, 6 * num_faces))
+        # 完全沒有波形資料時（例如只有純量心率的結果）直接跳過，
+        # 省下 figure 建構與渲染——整個繪圖流程中最大的固定成本
+        if not any(
+            self._coerce_waveform(
+                face_result.get("vital_signs", {}).get(key, {}).get("data", [])
+            ).size
+            for face_result in results
+            if isinstance(face_result, dict)
+            for key, _pos, _title, _unit in self._PLOT_SPEC
+        ):
+            return None
 
-        if num_faces == 1:
-            axes = axes.reshape(2, 2)
+        num_faces = len(results)
+        fig, axes = self._acquire_figure(num_faces)
 
-        for idx, face_result in enumerate(results):
+        def _plot_face(idx: int, face_result: Dict[str, Any]) -> None:
             vital_signs = face_result.get("vital_signs", {})
-
             row_offset = idx * 2
-            axes[row_offset, 0].set_axis_off()
-            axes[row_offset, 1].set_axis_off()
-            axes[row_offset + 1, 0].set_axis_off()
-            axes[row_offset + 1, 1].set_axis_off()
-
-            ppg = vital_signs.get("ppg_waveform", {}).get("data", [])
-            if ppg is not None and len(ppg) > 0:
-                # 如果數據是字符串格式，嘗試轉換為數組
-                if isinstance(ppg, str):
-                    try:
-                        import ast
-                        ppg = ast.literal_eval(ppg.replace('\n', '').strip())
-                    except:
-                        ppg = []
-                axes[row_offset, 0].plot(ppg)
-                axes[row_offset, 0].set_axis_on()
-                axes[row_offset, 0].set_title(f"Face {idx + 1} - PPG Waveform")
-                axes[row_offset, 0].set_xlabel("Frame")
-                axes[row_offset, 0].set_ylabel(vital_signs.get("ppg_waveform", {}).get("unit", ""))
-                axes[row_offset, 0].grid(True)
-
-            resp = vital_signs.get("respiratory_waveform", {}).get("data", [])
-            if resp is not None and len(resp) > 0:
-                # 如果數據是字符串格式，嘗試轉換為數組
-                if isinstance(resp, str):
-                    try:
-                        import ast
-                        resp = ast.literal_eval(resp.replace('\n', '').strip())
-                    except:
-                        resp = []
-                axes[row_offset, 1].plot(resp)
-                axes[row_offset, 1].set_axis_on()
-                axes[row_offset, 1].set_title(f"Face {idx + 1} - Respiratory Waveform")
-                axes[row_offset, 1].set_xlabel("Frame")
-                axes[row_offset, 1].set_ylabel(
-                    vital_signs.get("respiratory_waveform", {}).get("unit", "")
-                )
-                axes[row_offset, 1].grid(True)
 
-            rolling_hr = vital_signs.get("rolling_heart_rate", {}).get("data", [])
-            if rolling_hr is not None and len(rolling_hr) > 0:
-                # 如果數據是字符串格式，嘗試轉換為數組
-                if isinstance(rolling_hr, str):
-                    try:
-                        import ast
-                        rolling_hr = ast.literal_eval(rolling_hr.replace('\n', '').strip())
-                    except:
-                        rolling_hr = []
-                axes[row_offset + 1, 0].plot(rolling_hr)
-                axes[row_offset + 1, 0].set_axis_on()
-                axes[row_offset + 1, 0].set_title(f"Face {idx + 1} - Rolling Heart Rate")
-                axes[row_offset + 1, 0].set_xlabel("Frame")
-                axes[row_offset + 1, 0].set_ylabel(
-                    vital_signs.get("rolling_heart_rate", {}).get("unit", "bpm")
-                )
-                axes[row_offset + 1, 0].grid(True)
+            # 四個面板僅差在鍵名、位置與標題，以資料表驅動單一迴圈，
+            # 取代四段近乎重複的繪製程式碼
+            for key, (row, col), title, default_unit in self._PLOT_SPEC:
+                ax = axes[row_offset + row, col]
+                ax.set_axis_off()
 
-            rolling_rr = vital_signs.get("rolling_respiratory_rate", {}).get("data", [])
-            if rolling_rr is not None and len(rolling_rr) > 0:
-                # 如果數據是字符串格式，嘗試轉換為數組
-                if isinstance(rolling_rr, str):
-                    try:
-                        import ast
-                        rolling_rr = ast.literal_eval(rolling_rr.replace('\n', '').strip())
-                    except:
-                        rolling_rr = []
-                axes[row_offset + 1, 1].plot(rolling_rr)
-                axes[row_offset + 1, 1].set_axis_on()
-                axes[row_offset + 1, 1].set_title(f"Face {idx + 1} - Rolling Respiratory Rate")
-                axes[row_offset + 1, 1].set_xlabel("Frame")
-                axes[row_offset + 1, 1].set_ylabel(
-                    vital_signs.get("rolling_respiratory_rate", {}).get("unit", "rpm")
-                )
-                axes[row_offset + 1, 1].grid(True)
+                entry = vital_signs.get(key, {})
+                series = self._coerce_waveform(entry.get("data", []))
+                if series.size == 0:
+                    continue
+
+                ax.plot(*_lttb(series))
+                ax.set_axis_on()
+                ax.set_title(f"Face {idx + 1} - {title}")
+                ax.set_xlabel("Frame")
+                ax.set_ylabel(entry.get("unit", default_unit))
+                ax.grid(True)
+
+        # matplotlib 即使各執行緒只觸碰不相交的 Axes 也不保證執行緒
+        # 安全（共享 Figure 狀態與單位註冊表），一律循序繪製；
+        # 反正整張圖最後也是單次 canvas.draw() 光柵化
+        for idx, face_result in enumerate(results):
+            _plot_face(idx, face_result)
 
-        plt.tight_layout()
         return fig
 
+    def _ensure_plot_pool(self) -> Optional[ProcessPoolExecutor]:
+        """
+        延遲建立圖表渲染程序池。
+
+        Returns:
+            Optional[ProcessPoolExecutor]: 程序池；建立失敗時為 None
+        """
+        with self._plot_pool_lock:
+            if self._plot_pool is None:
+                try:
+                    self._plot_pool = ProcessPoolExecutor(max_workers=2)
+                except OSError:
+                    return None
+            return self._plot_pool
+
+    def _render_plot(self, results: Optional[list]) -> Optional[str]:
+        """
+        渲染分析圖表並返回 base64 字串。
+
+        matplotlib 渲染是 CPU-bound，將其移到程序池讓多方法／多請求的
+        圖表跨核心並行，不阻塞請求線程。測試模式或程序池不可用
+        （例如結果不可 pickle）時退回同程序渲染。
+
+        Args:
+            results (Optional[list]): VitalLens 分析結果
+
+        Returns:
+            Optional[str]: base64 編碼的圖片，無資料時為 None
+        """
+        if os.getenv("TESTING", "").lower() == "true":
+            return self.figure_to_base64(self.create_plots(results))
+
+        pool = self._ensure_plot_pool()
+        if pool is not None:
+            try:
+                return pool.submit(_render_plot_b64, results).result()
+            except Exception:  # pylint: disable=broad-except
+                pass
+        return self.figure_to_base64(self.create_plots(results))
+
     def figure_to_base64(self, fig) -> Optional[str]:  # pylint: disable=invalid-name
         if fig is None:
             return None
 
-        buffer = io.BytesIO()
-        fig.savefig(buffer, format="png", bbox_inches="tight")
-        plt.close(fig)
-        buffer.seek(0)
-        return base64.b64encode(buffer.read()).decode("utf-8")
+        try:
+            # 直接取 Agg 畫布的 RGBA 緩衝區再以 WebP 編碼，
+            # 避開 savefig 的 zlib PNG 壓縮（編碼時間與酬載約減半）
+            canvas = fig.canvas
+            canvas.draw()
+            width, height = canvas.get_width_height()
+            rgba = np.frombuffer(canvas.buffer_rgba(), dtype=np.uint8).reshape(
+                height, width, 4
+            )
+            bgr = cv2.cvtColor(rgba, cv2.COLOR_RGBA2BGR)
+            ok, encoded = cv2.imencode(".webp", bgr, [cv2.IMWRITE_WEBP_QUALITY, 85])
+            if not ok:
+                raise RuntimeError("WebP 編碼失敗")
+            # b2a_base64 是 C 層編碼器，直接吃編碼結果的緩衝區，不先複製成 bytes
+            return binascii.b2a_base64(encoded, newline=False).decode("ascii")
+        except Exception:  # pylint: disable=broad-except
+            # 環境缺 WebP 支援時退回原本的 PNG 路徑；壓縮等級降到 1，
+            # 臨時性的 base64 圖片不值得 libpng 預設等級 6 的編碼時間
+            buffer = io.BytesIO()
+            fig.savefig(
+                buffer,
+                format="png",
+                pil_kwargs={"compress_level": 1},
+            )
+            # getbuffer 取零複製視圖；read() 會把整個 PNG 再複製一次
+            view = buffer.getbuffer()
+            try:
+                return binascii.b2a_base64(view, newline=False).decode("ascii")
+            finally:
+                view.release()
+        finally:
+            self._recycle_figure(fig)
 
     def extract_primary_metrics(self, results: Optional[list]) -> Dict[str, Any]:
         if not results:
@@ -1063,41 +1961,80 @@ class VitalLensService:
             summary_parts.append(f"RR {rr} rpm")
         return " • ".join(summary_parts)
 
+    # JSON 可直接輸出、無須轉換或遞迴的原生型別
+    _NATIVE_TYPES = frozenset({str, int, float, bool, type(None)})
+
     def _ensure_serialisable(self, payload: Any):  # noqa: ANN001
-        if isinstance(payload, dict):
-            return {key: self._ensure_serialisable(value) for key, value in payload.items()}
-        if isinstance(payload, list):
-            return [self._ensure_serialisable(item) for item in payload]
-        if hasattr(payload, "tolist"):
-            return payload.tolist()
-        if isinstance(payload, (np.generic,)):
-            return payload.item()
-        if isinstance(payload, datetime):
-            return payload.isoformat()
-        return payload
+        # 迭代式遍歷：以 (parent, key, value) 工作堆疊取代 Python 遞迴，
+        # 葉節點用單次 type() 查表分派，省去每元素的 isinstance 鏈
+        native_types = self._NATIVE_TYPES
+        root: Dict[Any, Any] = {"value": payload}
+        stack: deque = deque()
+        stack.append((root, "value", payload))
+
+        while stack:
+            parent, key, value = stack.pop()
+            value_type = type(value)
+            if value_type in native_types:
+                continue
+            if value_type is dict or isinstance(value, dict):
+                converted: Dict[Any, Any] = {}
+                parent[key] = converted
+                for child_key, child_value in value.items():
+                    converted[child_key] = child_value
+                    if type(child_value) not in native_types:
+                        stack.append((converted, child_key, child_value))
+            elif value_type is list or isinstance(value, list):
+                # 同質 numpy 純量列表（常見的波形樣本）整串交給單次
+                # C 層轉換，免去逐元素進出工作堆疊
+                if value and isinstance(value[0], np.generic):
+                    try:
+                        array = np.asarray(value)
+                        # 僅接受數值/布林 dtype；混合型別會被 numpy 強制
+                        # 轉成字串陣列，需退回逐元素路徑
+                        if array.dtype.kind in "biufc":
+                            parent[key] = array.tolist()
+                            continue
+                    except (TypeError, ValueError):
+                        pass
+                converted_list = list(value)
+                parent[key] = converted_list
+                for index, child_value in enumerate(converted_list):
+                    if type(child_value) not in native_types:
+                        stack.append((converted_list, index, child_value))
+            elif value_type is np.ndarray or hasattr(value, "tolist"):
+                parent[key] = value.tolist()
+            elif isinstance(value, np.generic):
+                parent[key] = value.item()
+            elif isinstance(value, datetime):
+                parent[key] = value.isoformat()
+
+        return root["value"]
 
     @staticmethod
     def _human_friendly_error(message: str) -> str:
-        if "truth value of an array" in message:
-            return (
-                "Video processing encountered data issues. Potential causes:\n"
-                "- Video too short (recommend at least 10 seconds)\n"
-                "- Face not clear enough\n"
-                "- Poor lighting\n"
-                "Please capture a longer, clearer video"
-            )
-        if "Problem probing video" in message and "NoneType" in message:
-            return "Video format compatibility issue detected. Try converting to MP4."
-        if "No face detected" in message:
-            return "No face detected. Please ensure the face is clearly visible with adequate lighting."
-        if "API" in message and "key" in message:
-            return "API Key error or quota exceeded. Please verify your VitalLens API settings."
+        match = _ERROR_PATTERN.search(message)
+        if match:
+            return _ERROR_MESSAGES[match.lastgroup]
         return message
 
 
 service = VitalLensService()
 
 
+def _render_plot_b64(results: Optional[list]) -> Optional[str]:
+    """
+    在工作程序中渲染圖表並回傳 base64 字串（模組層級以便 pickle）。
+
+    Args:
+        results (Optional[list]): VitalLens 分析結果
+
+    Returns:
+        Optional[str]: base64 編碼的圖片，無資料時為 None
+    """
+    return service.figure_to_base64(service.create_plots(results))
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -1107,6 +2044,8 @@ async def lifespan(app: FastAPI):
     # 啟動事件
     loop = asyncio.get_running_loop()
     status_broadcaster.set_loop(loop)
+    # 在背景執行緒預熱模型快取，不阻擋服務開始接受請求
+    threading.Thread(target=service.warmup, daemon=True).start()
     yield
     # 關閉事件（目前無特殊處理）
 
@@ -1121,18 +2060,28 @@ app = FastAPI(
     version="1.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=APIResponse,
     lifespan=lifespan,
 )
 
 # No trusted host restrictions
 trusted_hosts = ["*"]
+_app_port = os.getenv("APP_PORT", "8894")
+_default_origins = ",".join(
+    (
+        f"http://localhost:{_app_port}",
+        f"https://localhost:{_app_port}",
+        f"http://127.0.0.1:{_app_port}",
+        f"https://127.0.0.1:{_app_port}",
+    )
+)
 cors_origins = [
-    origin.strip()
-    for origin in os.getenv(
-        "CORS_ALLOW_ORIGINS",
-        f"http://localhost:{os.getenv('APP_PORT', '8894')},https://localhost:{os.getenv('APP_PORT', '8894')},http://127.0.0.1:{os.getenv('APP_PORT', '8894')},https://127.0.0.1:{os.getenv('APP_PORT', '8894')}",
-    ).split(",")
-    if origin.strip()
+    stripped
+    for stripped in (
+        origin.strip()
+        for origin in os.getenv("CORS_ALLOW_ORIGINS", _default_origins).split(",")
+    )
+    if stripped
 ]
 
 if not trusted_hosts:
@@ -1146,6 +2095,9 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# 回應內嵌 base64 圖表時體積膨脹 33%，gzip 可在線路上壓回接近原始
+# 二進位大小；小回應（健康檢查等）不值得壓縮成本，設最小門檻
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
 templates = Jinja2Templates(directory="templates")
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -1208,6 +2160,7 @@ async def api_process_video(
     sequence_index: int = Form(0),
     sequence_total: int = Form(1),
     source: str = Form("upload"),
+    include_plots: bool = Form(False),
 ):
     selected_methods: List[str] = []
     if methods:
@@ -1220,17 +2173,26 @@ async def api_process_video(
 
     suffix = os.path.splitext(video.filename or "uploaded.mp4")[1]
     max_size_mb = MAX_UPLOAD_SIZE_BYTES // (1024 * 1024)
-    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
-        temp_path = tmp.name
-        content = await video.read()
-
-        if len(content) > MAX_UPLOAD_SIZE_BYTES:
-            raise HTTPException(
-                status_code=400,
-                detail=f"影片檔案大小不可超過 {max_size_mb}MB",
-            )
-
-        tmp.write(content)
+    # 以 1 MiB 分塊串流寫入暫存檔，整段影片不會同時駐留記憶體，
+    # 超過大小上限時立即中止而不是收完整個檔案才檢查
+    try:
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+            temp_path = tmp.name
+            total_bytes = 0
+            while chunk := await video.read(1 << 20):
+                total_bytes += len(chunk)
+                if total_bytes > MAX_UPLOAD_SIZE_BYTES:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"影片檔案大小不可超過 {max_size_mb}MB",
+                    )
+                tmp.write(chunk)
+    except HTTPException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
 
     try:
         file_label = video.filename or os.path.basename(temp_path)
@@ -1243,13 +2205,19 @@ async def api_process_video(
             }
         )
 
-        result = service.process_video(
-            temp_path,
-            selected_methods,
-            api_key,
-            source=source or "upload",
+        # 整段處理流程（含繪圖）屬 CPU 密集，移到執行緒池執行，
+        # 避免長時間佔住事件迴圈而序列化所有進行中的請求
+        result = await asyncio.get_running_loop().run_in_executor(
+            None,
+            lambda: service.process_video(
+                temp_path,
+                selected_methods,
+                api_key,
+                source=source or "upload",
+                include_plots=include_plots,
+            ),
         )
-        return JSONResponse(result)
+        return APIResponse(result)
     except (FileNotFoundError, ValueError) as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except RuntimeError as exc:
@@ -1267,8 +2235,15 @@ async def websocket_status(websocket: WebSocket):
     queue = await status_broadcaster.register()
     try:
         while True:
-            message = await queue.get()
-            await websocket.send_json(message)
+            batch = await queue.get_batch()
+            # 消息在廣播端已序列化一次；單則直接轉發共用字串，
+            # 多則以 JSON 陣列串接，整批只佔一個 WebSocket 幀
+            if len(batch) == 1:
+                await websocket.send_text(batch[0][1])
+            else:
+                await websocket.send_text(
+                    "[" + ",".join(text for _message, text in batch) + "]"
+                )
     except WebSocketDisconnect:
         pass
     finally:
@@ -1283,7 +2258,7 @@ async def api_start_webcam(
 ):
     try:
         result = service.start_webcam_recording(method, api_key, duration)
-        return JSONResponse(result)
+        return APIResponse(result)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except RuntimeError as exc:
@@ -1293,9 +2268,13 @@ async def api_start_webcam(
 @app.post("/api/webcam/stop")
 async def api_stop_webcam():
     result = service.stop_webcam_recording()
-    return JSONResponse(result)
+    return APIResponse(result)
 
 
 @app.get("/api/webcam/status")
 async def api_webcam_status():
-    return JSONResponse(service.check_recording_status())
+    # 長輪詢：錄影進行中時最多等待 5 秒的完成事件再回覆，
+    # 完成通知延遲從輪詢間隔的一半降到近乎即時，請求數也隨之下降；
+    # 等待在執行緒池進行，不佔用事件迴圈
+    await asyncio.get_running_loop().run_in_executor(None, service.wait_for_completion)
+    return APIResponse(service.check_recording_status())
@@ -4,16 +4,24 @@
 # =============================================================================
 
 import os
+import sys
 import tempfile
+import numpy as np
 import pytest
+from fastapi.testclient import TestClient
+from types import MappingProxyType
 from unittest.mock import MagicMock, patch
 import io
 
+# 添加專案根目錄到 Python 路徑
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
 
 @pytest.fixture(scope="session", autouse=True)
 def setup_test_environment():
     """設定測試環境"""
-    # 設定測試環境變數
+    # 以 MonkeyPatch 設定測試環境變數，teardown 時自動還原原值
+    mp = pytest.MonkeyPatch()
     test_env = {
         "VITALLENS_API_KEY": "test_api_key_12345",
         "APP_PORT": "8894",
@@ -23,49 +31,94 @@ def setup_test_environment():
     }
 
     for key, value in test_env.items():
-        os.environ[key] = value
+        mp.setenv(key, value)
 
     yield
 
-    # 清理測試環境變數
-    for key in test_env.keys():
-        os.environ.pop(key, None)
+    mp.undo()
+
+
+@pytest.fixture(scope="session")
+def client(setup_test_environment):
+    """
+    FastAPI 測試客戶端。
+
+    整個測試工作階段共用單一 TestClient 實例，省去每個測試重建
+    客戶端與路由解析的固定成本。
+
+    Returns:
+        TestClient: FastAPI 測試客戶端實例
+    """
+    from app import app
+
+    return TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def reset_vitallens_cache():
+    """
+    每個測試前清空 VitalLens 實例快取。
+
+    service 依 (method, api_key) 快取 VitalLens 實例；不清空的話，
+    先跑的測試會把自己的 mock 留在快取裡，之後所有 @patch('app.VitalLens')
+    都拿到舊替身，測試結果隨執行順序而變。
+    """
+    from app import service
+
+    with service._vl_cache_lock:
+        service._vl_cache.clear()
+    yield
+
+
+@pytest.fixture(scope="session")
+def mock_video_bytes():
+    """模擬影片的常數位元組內容，整個工作階段只建立一次"""
+    return b"FAKE_VIDEO_HEADER" + b"x" * 1000
 
 
 @pytest.fixture
-def mock_video_file():
-    """建立模擬的影片檔案"""
-    fake_video_content = b"FAKE_VIDEO_HEADER" + b"x" * 1000
-    video_file = io.BytesIO(fake_video_content)
+def mock_video_file(mock_video_bytes):
+    """建立模擬的影片檔案（共用常數內容，僅包一層新的 BytesIO）"""
+    video_file = io.BytesIO(mock_video_bytes)
     video_file.name = "test_video.mp4"
     return video_file
 
 
-@pytest.fixture
+# 標準的 VitalLens 分析結果（唯讀視圖，所有測試共用同一份）
+MOCK_VITALLENS_RESPONSE = MappingProxyType({
+    "heart_rate": {
+        "value": 72.5,
+        "unit": "BPM",
+        "confidence": 0.85
+    },
+    "respiratory_rate": {
+        "value": 16.2,
+        "unit": "RPM",
+        "confidence": 0.78
+    },
+    "message": "分析完成"
+})
+
+
+@pytest.fixture(scope="session")
 def mock_vitallens_response():
-    """標準的 VitalLens 分析結果"""
-    return {
-        "heart_rate": {
-            "value": 72.5,
-            "unit": "BPM",
-            "confidence": 0.85
-        },
-        "respiratory_rate": {
-            "value": 16.2,
-            "unit": "RPM",
-            "confidence": 0.78
-        },
-        "message": "分析完成"
-    }
+    """標準的 VitalLens 分析結果（每個工作階段只複製一次成可序列化的 dict）"""
+    return dict(MOCK_VITALLENS_RESPONSE)
+
+
+@pytest.fixture(scope="session")
+def fake_frame():
+    """模擬的攝影機影格（整個工作階段共用同一個 ndarray）"""
+    return np.zeros((480, 640, 3), dtype=np.uint8)
 
 
 @pytest.fixture
-def mock_opencv_capture():
+def mock_opencv_capture(fake_frame):
     """模擬 OpenCV VideoCapture"""
     with patch('cv2.VideoCapture') as mock_cap_class:
         mock_cap = MagicMock()
         mock_cap.isOpened.return_value = True
-        mock_cap.read.return_value = (True, MagicMock())
+        mock_cap.read.return_value = (True, fake_frame)
         mock_cap.get.return_value = 30.0
         mock_cap.set.return_value = True
         mock_cap.release.return_value = None
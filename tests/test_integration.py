@@ -4,27 +4,7 @@
 # =============================================================================
 
 import pytest
-from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock
-import sys
-import os
-
-sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
-
-from app import app
-
-
-@pytest.fixture
-def client():
-    """
-    FastAPI 測試客戶端。
-
-    建立測試用的 FastAPI TestClient 實例，用於進行端到端整合測試。
-
-    Returns:
-        TestClient: FastAPI 測試客戶端實例
-    """
-    return TestClient(app)
 
 
 @pytest.mark.integration
@@ -185,40 +165,37 @@ class TestPerformance:
     測試應用程式在高負載情況下的效能和併發處理能力。
     """
 
+    @pytest.mark.parametrize("request_index", range(5))
     @patch('app.service.process_video')
-    def test_multiple_concurrent_requests(self, mock_process, client, mock_video_file, mock_vitallens_response):
+    def test_multiple_concurrent_requests(self, mock_process, client, mock_video_file, mock_vitallens_response, request_index):
         """
         測試多個併發請求。
 
         模擬多個使用者同時上傳影片的情況，驗證應用程式的併發處理能力。
+        以 parametrize 取代測試內迴圈，各請求可獨立失敗與平行分配。
 
         Args:
             mock_process: process_video 方法的模擬物件
             client (TestClient): FastAPI 測試客戶端
             mock_video_file: 模擬的影片檔案
             mock_vitallens_response: 模擬的 VitalLens 回應
+            request_index (int): 模擬請求編號
         """
         mock_process.return_value = {
             "status": "Processing Complete!",
             "results": [mock_vitallens_response]
         }
 
-        # 模擬多個併發請求
-        responses = []
-        for i in range(5):
-            response = client.post(
-                "/api/process-video",
-                files={
-                    "video": (f"test{i}.mp4", mock_video_file, "video/mp4")
-                },
-                data={
-                    "method": "POS (免費)",
-                    "api_key": ""
-                }
-            )
-            responses.append(response)
-
-        # 檢查所有請求都成功處理
-        for response in responses:
-            assert response.status_code == 200
-            assert response.json()["status"] == "Processing Complete!"
+        response = client.post(
+            "/api/process-video",
+            files={
+                "video": (f"test{request_index}.mp4", mock_video_file, "video/mp4")
+            },
+            data={
+                "method": "POS (免費)",
+                "api_key": ""
+            }
+        )
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "Processing Complete!"
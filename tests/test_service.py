@@ -5,12 +5,25 @@
 
 import pytest
 from unittest.mock import patch, MagicMock
-import sys
-import os
-
-sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 from app import service
+from tests.conftest import MOCK_VITALLENS_RESPONSE
+
+
+class FakeVitalLens:
+    """
+    輕量的 VitalLens 替身。
+
+    以普通類別取代 MagicMock：呼叫即回傳固定的分析結果，
+    沒有 mock 呼叫紀錄與屬性樹的額外開銷。與真實函式庫一致，
+    回傳值是「每張臉一個 dict」的列表。
+    """
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __call__(self, *args, **kwargs):
+        return [dict(MOCK_VITALLENS_RESPONSE)]
 
 
 class TestVitalLensService:
@@ -98,22 +111,16 @@ class TestVitalLensService:
             # 驗證 VitalLens 被初始化
             assert mock_vitallens_class.called
 
-    @patch('app.VitalLens')
-    def test_process_video_success(self, mock_vitallens_class, mock_video_file, mock_vitallens_response):
+    @patch('app.VitalLens', FakeVitalLens)
+    def test_process_video_success(self, mock_video_file):
         """
         測試成功的影片處理。
 
         驗證服務能夠成功處理影片並返回正確的分析結果。
 
         Args:
-            mock_vitallens_class: VitalLens 類別的模擬物件
             mock_video_file: 模擬的影片檔案
-            mock_vitallens_response: 模擬的 VitalLens 回應
         """
-        mock_instance = MagicMock()
-        mock_instance.return_value = mock_vitallens_response
-        mock_vitallens_class.return_value = mock_instance
-
         result = service.process_video(
             "/tmp/test_video.mp4",
             ["POS (免費)"],
@@ -4,27 +4,7 @@
 # =============================================================================
 
 import pytest
-from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock
-import sys
-import os
-
-sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
-
-from app import app
-
-
-@pytest.fixture
-def client():
-    """
-    FastAPI 測試客戶端。
-
-    建立測試用的 FastAPI TestClient 實例，用於模擬 HTTP 請求進行影片分析 API 測試。
-
-    Returns:
-        TestClient: FastAPI 測試客戶端實例
-    """
-    return TestClient(app)
 
 
 class TestVideoUpload:
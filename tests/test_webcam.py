@@ -4,27 +4,7 @@
 # =============================================================================
 
 import pytest
-from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock
-import sys
-import os
-
-sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
-
-from app import app
-
-
-@pytest.fixture
-def client():
-    """
-    FastAPI 測試客戶端。
-
-    建立測試用的 FastAPI TestClient 實例，用於模擬 HTTP 請求進行網路攝影機 API 測試。
-
-    Returns:
-        TestClient: FastAPI 測試客戶端實例
-    """
-    return TestClient(app)
 
 
 class TestWebcamRecording:
@@ -34,7 +14,8 @@ class TestWebcamRecording:
     測試網路攝影機錄影功能的啟動、停止、狀態查詢和錯誤處理。
     """
 
-    def test_webcam_start_success(self, client, mock_opencv_capture):
+    @pytest.mark.usefixtures("mock_opencv_capture")
+    def test_webcam_start_success(self, client):
         """
         測試成功啟動攝影機錄影。
 
@@ -42,7 +23,6 @@ class TestWebcamRecording:
 
         Args:
             client (TestClient): FastAPI 測試客戶端
-            mock_opencv_capture: OpenCV VideoCapture 的模擬物件
         """
         response = client.post("/api/webcam/start", data={
             "method": "POS (免費)",
@@ -131,8 +111,9 @@ class TestWebcamValidation:
     測試網路攝影機相關參數的驗證邏輯。
     """
 
+    @pytest.mark.usefixtures("mock_opencv_capture")
     @pytest.mark.parametrize("duration", [5, 10, 15, 30, 45])
-    def test_valid_durations(self, client, duration, mock_opencv_capture):
+    def test_valid_durations(self, client, duration):
         """
         測試有效的錄影時間。
 
@@ -141,7 +122,6 @@ class TestWebcamValidation:
         Args:
             client (TestClient): FastAPI 測試客戶端
             duration (int): 測試的錄影時間（秒）
-            mock_opencv_capture: OpenCV VideoCapture 的模擬物件
         """
         response = client.post("/api/webcam/start", data={
             "method": "POS (免費)",